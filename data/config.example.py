@@ -22,6 +22,7 @@ config = {
         'piece_size': 'auto',  # in KB, or 'auto'
         'private': True,
         'comment': 'Created with Music-Upload-Assistant',
+        'hash_workers': 'auto',  # threads used to hash pieces, or 'auto'
         # Announce URL for torrent creation
         'announce_url': 'https://your-tracker.net/announce/YOUR_ANNOUNCE_TOKEN',
     },
@@ -30,7 +31,8 @@ config = {
     'upload': {
         'default_format': 'FLAC',
         'default_media': 'WEB',
-        'default_release_type': 'Album'
+        'default_release_type': 'Album',
+        'upload_rate_kbs': -1,  # upstream bandwidth in KB/s, sizes batch uploads; -1 if unlimited
     },
     
     # Uploader info
@@ -51,6 +53,8 @@ config = {
         'password': 'YOUR_PASSWORD',             # qBittorrent WebUI password
         'auto_start': True,                      # Automatically start torrents
         'default_save_path': '',                 # Leave empty to use qBittorrent default
+        'connect_timeout': 5,                    # Seconds to wait for the WebUI to accept a connection
+        'read_timeout': 30,                      # Seconds to wait for a WebUI response
         'use_original_path': True                # Use the original path of files for seeding
     },
     
@@ -117,6 +121,11 @@ config = {
             'upload_url': 'https://seedpool.org/api/torrents/upload',
             'source_name': 'seedpool.org',
             'anon': False,
+            'max_torrent_bytes': 10 * 1024 * 1024,  # larger .torrent files are rejected before upload
+            'max_mediainfo_bytes': 256 * 1024,  # longer mediainfo dumps are truncated
+            'connect_timeout': 10,  # seconds to wait for a connection
+            'read_timeout': 60,  # seconds to wait on the tracker once connected
+            'upload_retries': 2,  # retries when the tracker answers 429 or 503
             'api_auth_type': 'param',
             'api_format': 'form',
             'category_ids': {
@@ -32,6 +32,9 @@ class QBittorrentClient:
         self.auto_start = qbt_config.get('auto_start', True)
         self.default_save_path = qbt_config.get('default_save_path', '')
         
+        # (connect, read) timeouts so a hung WebUI can't block the upload run
+        self.timeout = (float(qbt_config.get('connect_timeout', 5)), float(qbt_config.get('read_timeout', 30)))
+        
         # Remove trailing slash if present
         if self.host.endswith('/'):
             self.host = self.host[:-1]
@@ -64,7 +67,7 @@ class QBittorrentClient:
         }
         
         try:
-            response = self.session.post(url, data=data)
+            response = self.session.post(url, data=data, timeout=self.timeout)
             
             if response.status_code == 200 and response.text == "Ok.":
                 logger.info("Successfully logged in to qBittorrent")
@@ -123,21 +126,17 @@ class QBittorrentClient:
         # Set auto start/pause
         form_data['paused'] = "false" if self.auto_start else "true"
         
-        # Prepare files
-        files = {
-            'torrents': (
-                os.path.basename(torrent_path),
-                open(torrent_path, 'rb'),
-                'application/x-bittorrent'
-            )
-        }
-        
         try:
-            # Make API call to add torrent
-            response = self.session.post(url, data=form_data, files=files)
-            
-            # Close file handle
-            files['torrents'][1].close()
+            # Make API call to add torrent; the handle is closed on any exit
+            with open(torrent_path, 'rb') as torrent_file:
+                files = {
+                    'torrents': (
+                        os.path.basename(torrent_path),
+                        torrent_file,
+                        'application/x-bittorrent'
+                    )
+                }
+                response = self.session.post(url, data=form_data, files=files, timeout=self.timeout)
             
             # Check response
             if response.status_code != 200:
@@ -162,12 +161,6 @@ class QBittorrentClient:
             return True, "Torrent added successfully"
                 
         except Exception as e:
-            # Ensure file handle is closed
-            try:
-                files['torrents'][1].close()
-            except:
-                pass
-                
             logger.error(f"Error adding torrent to qBittorrent: {e}")
             return False, f"Error adding torrent: {e}"
     
@@ -191,7 +184,7 @@ class QBittorrentClient:
         try:
             # Get list of torrents
             url = f"{self.host}/api/v2/torrents/info"
-            response = self.session.get(url)
+            response = self.session.get(url, timeout=self.timeout)
             
             if response.status_code != 200:
                 return False, f"Failed to get torrent list: {response.text}"
@@ -256,7 +249,7 @@ class QBittorrentClient:
             }
             
             # Make API call
-            response = self.session.post(url, data=form_data, files=files)
+            response = self.session.post(url, data=form_data, files=files, timeout=self.timeout)
             
             # Check response
             if response.status_code == 200:
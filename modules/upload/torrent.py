@@ -1,17 +1,83 @@
 import os
+import mmap
 import time
 import math
+import bisect
 import logging
 import hashlib
-from typing import Dict, Any, List, Union
+from collections import deque
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Iterable, Iterator, List, Tuple, Union
 
 logger = logging.getLogger(__name__)
 
-try:
-    import bencodepy
-except ImportError:
-    logger.error("bencodepy module not found. Please install it with 'pip install bencodepy'")
-    bencodepy = None
+
+def _piece_digest(data) -> bytes:
+    return hashlib.sha1(data).digest()
+
+
+def _piece_digests(buffers: List[Any]) -> bytes:
+    return b''.join([hashlib.sha1(buf).digest() for buf in buffers])
+
+
+def _bencode_to(write, obj: Any) -> None:
+    """
+    Bencode obj, handing the output to write() as it is produced.
+
+    Byte strings (notably the multi-megabyte 'pieces' value) are passed to
+    write() as-is instead of being copied into one encoded buffer first.
+    """
+    if isinstance(obj, int):
+        write(b'i%de' % obj)
+    elif isinstance(obj, (bytes, bytearray)):
+        write(b'%d:' % len(obj))
+        write(obj)
+    elif isinstance(obj, str):
+        _bencode_to(write, obj.encode('utf-8'))
+    elif isinstance(obj, (list, tuple)):
+        write(b'l')
+        for item in obj:
+            _bencode_to(write, item)
+        write(b'e')
+    elif isinstance(obj, dict):
+        write(b'd')
+        for key in sorted(obj):
+            _bencode_to(write, key)
+            _bencode_to(write, obj[key])
+        write(b'e')
+    else:
+        raise TypeError(f"Cannot bencode object of type {type(obj).__name__}")
+
+
+# Not available on Windows or older Pythons; prefetching is skipped there.
+_MADV_WILLNEED   = getattr(mmap, 'MADV_WILLNEED', None)
+_MADV_SEQUENTIAL = getattr(mmap, 'MADV_SEQUENTIAL', None)
+_FADV_WILLNEED = getattr(os, 'POSIX_FADV_WILLNEED', None)
+
+# OS metadata files that should never end up in a torrent
+_IGNORED_FILES = frozenset({'Thumbs.db', 'desktop.ini'})
+
+# Characters not allowed in output filenames, mapped to '_'
+_SANITIZE_TABLE = str.maketrans(dict.fromkeys('<>:"/\\|?*', '_'))
+
+# Common piece-size tiers: (total size upper bound, piece size)
+_PIECE_SIZE_TIERS = (
+    (50 << 20,  16 << 10),
+    (150 << 20, 32 << 10),
+    (350 << 20, 64 << 10),
+    (512 << 20, 128 << 10),
+    (1 << 30,   256 << 10),
+    (2 << 30,   512 << 10),
+    (4 << 30,   1 << 20),
+    (8 << 30,   2 << 20),
+)
+_PIECE_SIZE_BOUNDS = [bound for bound, _ in _PIECE_SIZE_TIERS]
+_PIECE_SIZE_MAX = 4 << 20
+
+# Bytes of small pieces hashed per pool task, so thread hand-off does not
+# outweigh the hashing itself
+_HASH_BATCH_BYTES = 256 << 10
 
 
 class TorrentCreator:
@@ -25,6 +91,7 @@ class TorrentCreator:
         self.default_comment  = self.torrent_config.get('comment', 'Created with Music-Upload-Assistant')
         self.default_source   = self.torrent_config.get('source', 'MUA')
         self.default_private  = self.torrent_config.get('private', True)
+        self.hash_workers     = self.torrent_config.get('hash_workers', 'auto')
 
     def create_torrent(self,
                        path: str,
@@ -36,11 +103,13 @@ class TorrentCreator:
                        piece_size: Union[int, str] = None,
                        custom_name: str = None
     ) -> str:
-        if not bencodepy:
-            raise ImportError("bencodepy module is required for torrent creation")
         if not os.path.exists(path):
             raise FileNotFoundError(f"Path not found: {path}")
 
+        is_dir = os.path.isdir(path)
+        name   = os.path.basename(path.rstrip(os.sep))
+        now    = int(time.time())
+
         # Determine announce URL: CLI → config['torrent'] → top‑level
         announce_url = (
             announce_url
@@ -55,41 +124,51 @@ class TorrentCreator:
         private    = private if private is not None else self.default_private
         created_by = created_by or "Music-Upload-Assistant"
 
+        # Scan the tree once; the file list and sizes feed the piece size,
+        # the info dict and the hashing pass, so each file is stat'ed once.
+        if is_dir:
+            files      = self._scan_tree(path)
+            total_size = sum(file_info['length'] for file_info in files)
+        else:
+            files      = None
+            total_size = os.path.getsize(path)
+
         # Calculate piece size
         if piece_size == 'auto' or piece_size is None:
-            piece_size = self._calculate_piece_size(path)
+            piece_size = self._calculate_piece_size(total_size)
         else:
             piece_size = int(piece_size) * 1024
 
         logger.info(f"Creating torrent for {path} with piece size {piece_size//1024}KB")
 
         # Build info dictionary
-        info = self._build_info_dict(path, piece_size)
+        info = self._build_info_dict(path, piece_size, name, files, total_size)
 
-        # Assemble metainfo
+        # Assemble metainfo. Keys are inserted in bencode (sorted) order so
+        # the encoder's key sort runs over already-ordered input.
+        if private:
+            info['private'] = 1
+        if source:
+            info['source'] = source
         metainfo = {
             'announce':       announce_url,
-            'info':           info,
-            'creation date':  int(time.time()),
+            'comment':        comment,
             'created by':     created_by,
-            'comment':        comment
+            'creation date':  now,
+            'info':           info
         }
-        if source:
-            metainfo['info']['source'] = source
-        if private:
-            metainfo['info']['private'] = 1
 
         # Determine output filename
         if custom_name:
             base = custom_name
-        elif os.path.isdir(path):
-            base = os.path.basename(path) or os.path.basename(os.path.dirname(path))
+        elif is_dir:
+            base = name
         else:
-            base = os.path.splitext(os.path.basename(path))[0]
+            base = os.path.splitext(name)[0]
         
         if not base or base == '.':
-            base = f"album_{int(time.time())}"
-        base = self._sanitize_filename(base)
+            base = f"album_{now}"
+        base = self._sanitize_filename(base, now)
 
         output_dir  = self.config.get('output_dir', os.path.dirname(path))
         os.makedirs(output_dir, exist_ok=True)
@@ -97,122 +176,280 @@ class TorrentCreator:
 
         # Write torrent file
         try:
-            encoded = bencodepy.encode(metainfo)
             with open(output_path, 'wb') as f:
-                f.write(encoded)
+                _bencode_to(f.write, metainfo)
             logger.info(f"Torrent file created: {output_path}")
             return output_path
         except Exception as e:
             logger.error(f"Error creating torrent file: {e}")
             raise
 
-    def _sanitize_filename(self, filename: str) -> str:
-        invalid = r'<>:"/\\|?*'
-        for ch in invalid:
-            filename = filename.replace(ch, '_')
-        filename = filename.strip('. ')
-        return filename or f"album_{int(time.time())}"
-
-    def _calculate_piece_size(self, path: str) -> int:
-        total = 0
-        if os.path.isdir(path):
-            for root, _, files in os.walk(path):
-                for file in files:
-                    total += os.path.getsize(os.path.join(root, file))
-        else:
-            total = os.path.getsize(path)
-
-        # Common piece‑size tiers
-        if total < 50*1024*1024:
-            return 16*1024
-        if total < 150*1024*1024:
-            return 32*1024
-        if total < 350*1024*1024:
-            return 64*1024
-        if total < 512*1024*1024:
-            return 128*1024
-        if total < 1*1024*1024*1024:
-            return 256*1024
-        if total < 2*1024*1024*1024:
-            return 512*1024
-        if total < 4*1024*1024*1024:
-            return 1024*1024
-        if total < 8*1024*1024*1024:
-            return 2*1024*1024
-        return 4*1024*1024
-
-    def _build_info_dict(self, path: str, piece_size: int) -> Dict[str, Any]:
-        if os.path.isdir(path):
-            return self._build_multi_file_info(path, piece_size)
+    def _sanitize_filename(self, filename: str, now: int = None) -> str:
+        filename = filename.translate(_SANITIZE_TABLE).strip('. ')
+        if filename:
+            return filename
+        return f"album_{now if now is not None else int(time.time())}"
+
+    def _calculate_piece_size(self, total: int) -> int:
+        idx = bisect.bisect_right(_PIECE_SIZE_BOUNDS, total)
+        if idx < len(_PIECE_SIZE_TIERS):
+            return _PIECE_SIZE_TIERS[idx][1]
+        return _PIECE_SIZE_MAX
+
+    def _build_info_dict(self,
+                         path: str,
+                         piece_size: int,
+                         name: str,
+                         files: List[Dict[str, Any]] = None,
+                         length: int = None
+    ) -> Dict[str, Any]:
+        if files is not None:
+            return self._build_multi_file_info(path, piece_size, name, files)
         else:
-            return self._build_single_file_info(path, piece_size)
+            return self._build_single_file_info(path, piece_size, name, length)
 
-    def _build_single_file_info(self, file_path: str, piece_size: int) -> Dict[str, Any]:
-        length = os.path.getsize(file_path)
-        pieces = self._calculate_pieces(file_path, piece_size)
+    def _build_single_file_info(self,
+                                file_path: str,
+                                piece_size: int,
+                                name: str,
+                                length: int = None
+    ) -> Dict[str, Any]:
+        if length is None:
+            length = os.path.getsize(file_path)
+        pieces = self._calculate_pieces(file_path, piece_size, length)
         return {
-            'name':         os.path.basename(file_path),
             'length':       length,
+            'name':         name,
             'piece length': piece_size,
             'pieces':       pieces
         }
 
-    def _build_multi_file_info(self, dir_path: str, piece_size: int) -> Dict[str, Any]:
-        name = os.path.basename(dir_path) or os.path.basename(os.path.dirname(dir_path))
-        files = []
-        for root, _, filenames in os.walk(dir_path):
-            for fn in sorted(filenames):
-                full = os.path.join(root, fn)
-                rel  = os.path.relpath(full, dir_path)
-                files.append({
-                    'length': os.path.getsize(full),
-                    'path':   rel.split(os.sep)
-                })
+    def _build_multi_file_info(self,
+                               dir_path: str,
+                               piece_size: int,
+                               name: str,
+                               files: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
         pieces = self._calculate_pieces_for_files(dir_path, files, piece_size)
         return {
-            'name':         name,
             'files':        files,
+            'name':         name,
             'piece length': piece_size,
             'pieces':       pieces
         }
 
-    def _calculate_pieces(self, file_path: str, piece_size: int) -> bytes:
-        sha1   = hashlib.sha1()
-        pieces = b''
-        with open(file_path, 'rb') as f:
+    def _scan_tree(self, dir_path: str) -> List[Dict[str, Any]]:
+        """Return the torrent 'files' entries for everything under dir_path."""
+        return [
+            {'length': size, 'path': parts}
+            for parts, size in self._iter_files(dir_path)
+        ]
+
+    def _iter_files(self, dir_path: str, prefix: List[str] = None) -> Iterator[Tuple[List[str], int]]:
+        """
+        Yield (relative path components, size) for each file under dir_path.
+
+        Hidden entries and OS metadata files are skipped. Files in a directory
+        come before its subdirectories, both in name order.
+        """
+        prefix = prefix or []
+        with os.scandir(dir_path) as it:
+            entries = sorted(it, key=lambda e: e.name)
+
+        subdirs = []
+        for entry in entries:
+            if entry.name.startswith('.') or entry.name in _IGNORED_FILES:
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                subdirs.append(entry)
+            elif entry.is_file():
+                yield prefix + [entry.name], entry.stat().st_size
+
+        for entry in subdirs:
+            yield from self._iter_files(entry.path, prefix + [entry.name])
+
+    def _calculate_pieces(self, file_path: str, piece_size: int, size: int = None) -> bytearray:
+        data = self._map_file(file_path, size)
+        return self._hash_pieces(
+            self._iter_mapped_pieces(data, piece_size),
+            math.ceil(len(data) / piece_size),
+            self._hash_workers(),
+            self._hash_batch(piece_size)
+        )
+
+    def _iter_mapped_pieces(self, data: memoryview, piece_size: int) -> Iterator[memoryview]:
+        size = len(data)
+        for start in range(0, size, piece_size):
+            end = start + piece_size
+            # Ask the kernel to start reading the next piece while the
+            # current one is being hashed.
+            if _MADV_WILLNEED is not None and end < size:
+                page = end - end % mmap.PAGESIZE
+                data.obj.madvise(_MADV_WILLNEED, page, min(end + piece_size, size) - page)
+            yield data[start:end]
+
+    def _hash_workers(self) -> int:
+        if self.hash_workers in (None, 'auto'):
+            return min(os.cpu_count() or 1, 8)
+        return max(int(self.hash_workers), 1)
+
+    @staticmethod
+    def _hash_batch(piece_size: int) -> int:
+        return max(_HASH_BATCH_BYTES // piece_size, 1)
+
+    def _hash_pieces(self,
+                     buffers: Iterable[Any],
+                     num_pieces: int,
+                     workers: int,
+                     batch: int = 1
+    ) -> bytearray:
+        """
+        Hash piece buffers and return the concatenated digests.
+
+        Digests are written into a buffer preallocated for num_pieces rather
+        than appended, so building the pieces string stays linear.
+        """
+        pieces = bytearray(num_pieces * 20)
+        i      = 0
+        for digests in self._iter_digests(buffers, workers, batch):
+            pieces[i:i + len(digests)] = digests
+            i += len(digests)
+        del pieces[i:]
+        return pieces
+
+    def _iter_digests(self, buffers: Iterable[Any], workers: int, batch: int = 1) -> Iterator[bytes]:
+        """
+        Yield the SHA-1 digests of the buffers, in order, as runs of
+        concatenated 20-byte digests.
+
+        hashlib releases the GIL while hashing, so pieces are hashed on several
+        cores at once, batch pieces per task. No more than two batches per
+        worker are in flight, which bounds memory use; a buffer is done with
+        once the next (2 * workers + 1) * batch buffers have been taken from
+        the iterator.
+        """
+        if workers == 1:
+            for buf in buffers:
+                yield _piece_digest(buf)
+            return
+
+        buffers = iter(buffers)
+        pending = deque()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
             while True:
-                chunk = f.read(piece_size)
+                chunk = list(islice(buffers, batch))
                 if not chunk:
                     break
-                sha1.update(chunk)
-                pieces += sha1.digest()
-                sha1 = hashlib.sha1()
-        return pieces
+                if len(pending) >= 2 * workers:
+                    yield pending.popleft().result()
+                pending.append(pool.submit(_piece_digests, chunk))
+            while pending:
+                yield pending.popleft().result()
+
+    def _prefetch_file(self, file_path: str) -> None:
+        """Ask the kernel to read file_path ahead asynchronously, where supported."""
+        if _FADV_WILLNEED is None:
+            return
+        try:
+            fd = os.open(file_path, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            self._fadvise(fd, _FADV_WILLNEED)
+        finally:
+            os.close(fd)
+
+    @staticmethod
+    def _fadvise(fd: int, advice: int) -> None:
+        # Advice is only a hint, so failures are not worth surfacing
+        if advice is None:
+            return
+        try:
+            os.posix_fadvise(fd, 0, 0, advice)
+        except OSError:
+            pass
 
     def _calculate_pieces_for_files(self,
                                     base_dir: str,
                                     files: List[Dict[str, Any]],
                                     piece_size: int
-    ) -> bytes:
-        sha1        = hashlib.sha1()
-        pieces      = b''
-        buffer_data = b''
-
-        for file_info in files:
-            full = os.path.join(base_dir, *file_info['path'])
-            with open(full, 'rb') as f:
-                while True:
-                    need = piece_size - len(buffer_data)
-                    data = f.read(need)
-                    if not data:
-                        break
-                    buffer_data += data
-                    if len(buffer_data) == piece_size:
-                        sha1.update(buffer_data)
-                        pieces += sha1.digest()
-                        buffer_data = b''
-                        sha1 = hashlib.sha1()
-        if buffer_data:
-            sha1.update(buffer_data)
-            pieces += sha1.digest()
-        return pieces
+    ) -> bytearray:
+        total_size = sum(file_info['length'] for file_info in files)
+        workers    = self._hash_workers()
+        batch      = self._hash_batch(piece_size)
+        return self._hash_pieces(
+            self._iter_file_pieces(base_dir, files, piece_size, (2 * workers + 1) * batch),
+            math.ceil(total_size / piece_size),
+            workers,
+            batch
+        )
+
+    def _iter_file_pieces(self,
+                          base_dir: str,
+                          files: List[Dict[str, Any]],
+                          piece_size: int,
+                          ring_size: int
+    ) -> Iterator[memoryview]:
+        """
+        Yield successive piece_size chunks of the files laid end to end.
+
+        Pieces lying inside one file are yielded as slices of its mmap, with
+        no copy. Only pieces spanning a file boundary are assembled, in a ring
+        of ring_size reusable buffers, so such a view is overwritten ring_size
+        pieces later.
+        """
+        ring   = [memoryview(bytearray(piece_size)) for _ in range(ring_size)]
+        slot   = 0
+        filled = 0
+
+        paths = [os.path.join(base_dir, *file_info['path']) for file_info in files]
+        for idx, full in enumerate(paths):
+            # Start reading the next file into the page cache while this
+            # one is being hashed.
+            if idx + 1 < len(paths):
+                self._prefetch_file(paths[idx + 1])
+            data = self._map_file(full, files[idx]['length'])
+            size = len(data)
+            pos  = 0
+
+            # Complete a piece carried over from the previous file
+            if filled:
+                pos = min(piece_size - filled, size)
+                ring[slot][filled:filled + pos] = data[:pos]
+                filled += pos
+                if filled < piece_size:
+                    continue
+                yield ring[slot]
+                slot   = (slot + 1) % ring_size
+                filled = 0
+
+            while size - pos >= piece_size:
+                yield data[pos:pos + piece_size]
+                pos += piece_size
+
+            if pos < size:
+                filled = size - pos
+                ring[slot][:filled] = data[pos:]
+        if filled:
+            yield ring[slot][:filled]
+
+    def _map_file(self, file_path: str, size: int = None) -> memoryview:
+        """
+        Return a read-only view of the file, backed by mmap.
+
+        size is the length already known from the tree scan; it saves a
+        stat and keeps the hashed bytes in line with the 'files' lengths.
+        The mapping is not closed explicitly: slices of it may still be
+        hashing on the pool, so it is unmapped once the last view is released.
+        """
+        if size == 0:
+            return memoryview(b'')
+        with open(file_path, 'rb') as f:
+            if size is None:
+                size = os.fstat(f.fileno()).st_size
+                if not size:
+                    return memoryview(b'')
+            mm = mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ)
+        if _MADV_SEQUENTIAL is not None:
+            mm.madvise(_MADV_SEQUENTIAL)
+        return memoryview(mm)
@@ -4,9 +4,10 @@ Handles tracker configuration and loading.
 """
 
 import os
+import asyncio
 import logging
 import importlib
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -24,10 +25,17 @@ class TrackerManager:
         """
         self.config = config
         self.trackers = {}
+        self._tracker_configs = {}
+        self._failed_trackers = set()
         self._load_trackers()
     
     def _load_trackers(self):
-        """Load all configured trackers."""
+        """
+        Record all enabled trackers.
+        
+        Tracker modules are not imported here; each one is loaded on first
+        use by get_tracker() and cached.
+        """
         if 'trackers' not in self.config:
             logger.warning("No trackers configured")
             return
@@ -42,77 +50,90 @@ class TrackerManager:
             if not enabled:
                 logger.debug(f"Tracker {tracker_id} is disabled")
                 continue
-                
+            
+            # Normalize tracker ID
+            self._tracker_configs[tracker_id.upper()] = tracker_config
+    
+    def _load_tracker(self, tracker_id: str):
+        """
+        Import and instantiate a single tracker, caching the result.
+        
+        Args:
+            tracker_id: Normalized (upper-case) tracker identifier
+            
+        Returns:
+            object: Tracker instance or None if it could not be loaded
+        """
+        tracker = None
+        try:
+            # Build the expected module name
+            module_name = f"modules.upload.trackers.{tracker_id.lower()}_tracker"
+            
+            # Try to import the module
             try:
-                # Normalize tracker ID
-                tracker_id = tracker_id.upper()
+                module = importlib.import_module(module_name)
+                logger.debug(f"Successfully imported module: {module_name}")
+            except ImportError as e:
+                logger.warning(f"Could not import tracker module {module_name}: {e}")
+                # Try to use GenericTracker as fallback
+                from modules.upload.trackers.generic_tracker import GenericTracker
+                logger.info(f"Using GenericTracker for {tracker_id}")
                 
-                # Try to dynamically load the tracker module
-                try:
-                    # Build the expected module name
-                    module_name = f"modules.upload.trackers.{tracker_id.lower()}_tracker"
-                    
-                    # Try to import the module
-                    try:
-                        module = importlib.import_module(module_name)
-                        logger.debug(f"Successfully imported module: {module_name}")
-                    except ImportError as e:
-                        logger.warning(f"Could not import tracker module {module_name}: {e}")
-                        # Try to use GenericTracker as fallback
-                        from modules.upload.trackers.generic_tracker import GenericTracker
-                        logger.info(f"Using GenericTracker for {tracker_id}")
-                        
-                        # Create a custom class on-the-fly
-                        class DynamicTracker(GenericTracker):
-                            def __init__(self, config):
-                                super().__init__(config, tracker_id)
-                        
-                        # Add the tracker
-                        tracker = DynamicTracker(self.config)
-                        if tracker.is_configured():
-                            self.trackers[tracker_id] = tracker
-                            logger.info(f"Created dynamic tracker for: {tracker_id}")
-                        else:
-                            logger.warning(f"Dynamic tracker {tracker_id} is not properly configured")
-                        continue
-                    
-                    # Get the expected class name (YUSTracker, SPTracker, etc.)
-                    expected_class_name = f"{tracker_id.capitalize()}Tracker"
-                    
-                    # Try to get the class from the module
-                    if hasattr(module, expected_class_name):
-                        tracker_class = getattr(module, expected_class_name)
-                    else:
-                        # Look for any class that ends with "Tracker"
-                        tracker_class = None
-                        for attr_name in dir(module):
-                            if attr_name.endswith("Tracker") and attr_name != "GenericTracker":
-                                tracker_class = getattr(module, attr_name)
-                                logger.debug(f"Found tracker class: {attr_name}")
-                                break
-                        
-                        if not tracker_class:
-                            raise AttributeError(f"No tracker class found in module {module_name}")
+                # Create a custom class on-the-fly
+                class DynamicTracker(GenericTracker):
+                    def __init__(self, config):
+                        super().__init__(config, tracker_id)
+                
+                # Add the tracker
+                tracker = DynamicTracker(self.config)
+                if tracker.is_configured():
+                    logger.info(f"Created dynamic tracker for: {tracker_id}")
+                else:
+                    logger.warning(f"Dynamic tracker {tracker_id} is not properly configured")
+                    tracker = None
+            else:
+                # Get the expected class name (YUSTracker, SPTracker, etc.)
+                expected_class_name = f"{tracker_id.capitalize()}Tracker"
+                
+                # Try to get the class from the module
+                if hasattr(module, expected_class_name):
+                    tracker_class = getattr(module, expected_class_name)
+                else:
+                    # Look for any class that ends with "Tracker"
+                    tracker_class = None
+                    for attr_name in dir(module):
+                        if attr_name.endswith("Tracker") and attr_name != "GenericTracker":
+                            tracker_class = getattr(module, attr_name)
+                            logger.debug(f"Found tracker class: {attr_name}")
+                            break
                     
-                    # Create an instance of the tracker class
-                    tracker = tracker_class(self.config)
+                    if not tracker_class:
+                        raise AttributeError(f"No tracker class found in module {module_name}")
+                
+                # Create an instance of the tracker class
+                tracker = tracker_class(self.config)
+                
+                # Check if properly configured
+                if hasattr(tracker, 'is_configured') and tracker.is_configured():
+                    logger.info(f"Loaded tracker: {tracker_id}")
+                else:
+                    logger.warning(f"Tracker {tracker_id} is not properly configured")
+                    tracker = None
                     
-                    # Check if properly configured
-                    if hasattr(tracker, 'is_configured') and tracker.is_configured():
-                        self.trackers[tracker_id] = tracker
-                        logger.info(f"Loaded tracker: {tracker_id}")
-                    else:
-                        logger.warning(f"Tracker {tracker_id} is not properly configured")
-                        
-                except Exception as e:
-                    logger.error(f"Error loading tracker {tracker_id}: {e}")
-            
-            except Exception as e:
-                logger.error(f"Unexpected error initializing tracker {tracker_id}: {e}")
+        except Exception as e:
+            logger.error(f"Error loading tracker {tracker_id}: {e}")
+            tracker = None
+        
+        # Remember failures too, so repeated lookups don't retry the import
+        if tracker is None:
+            self._failed_trackers.add(tracker_id)
+        else:
+            self.trackers[tracker_id] = tracker
+        return tracker
     
     def get_tracker(self, tracker_id: str):
         """
-        Get tracker by ID.
+        Get tracker by ID, loading it on first use.
         
         Args:
             tracker_id: Tracker identifier
@@ -120,7 +141,12 @@ class TrackerManager:
         Returns:
             object: Tracker instance or None if not found
         """
-        return self.trackers.get(tracker_id.upper())
+        tracker_id = tracker_id.upper()
+        if tracker_id in self.trackers:
+            return self.trackers[tracker_id]
+        if tracker_id in self._failed_trackers or tracker_id not in self._tracker_configs:
+            return None
+        return self._load_tracker(tracker_id)
     
     def get_available_trackers(self) -> List[str]:
         """
@@ -129,6 +155,8 @@ class TrackerManager:
         Returns:
             list: Available tracker IDs
         """
+        for tracker_id in self._tracker_configs:
+            self.get_tracker(tracker_id)
         return list(self.trackers.keys())
     
     def is_tracker_available(self, tracker_id: str) -> bool:
@@ -141,4 +169,48 @@ class TrackerManager:
         Returns:
             bool: True if available, False otherwise
         """
-        return tracker_id.upper() in self.trackers
+        return self.get_tracker(tracker_id) is not None
+    
+    async def upload_many(self,
+                          tracker_ids: List[str],
+                          torrent_path: str,
+                          description: str,
+                          metadata: Dict[str, Any],
+                          concurrency: int = 4
+    ) -> Dict[str, Tuple[bool, str]]:
+        """
+        Upload a torrent to several trackers at once.
+        
+        Uploads overlap on the network, with at most ``concurrency`` in
+        flight so upstream bandwidth is not split too thinly.
+        
+        Args:
+            tracker_ids: Tracker identifiers
+            torrent_path: Path to torrent file
+            description: Release description
+            metadata: Track or album metadata
+            concurrency: Maximum number of simultaneous uploads
+            
+        Returns:
+            dict: (success, message) for each tracker ID
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        loop = asyncio.get_running_loop()
+        
+        async def upload_one(tracker_id: str) -> Tuple[bool, str]:
+            tracker = self.get_tracker(tracker_id)
+            if not tracker:
+                return False, f"Tracker {tracker_id} not available"
+            async with semaphore:
+                try:
+                    if hasattr(tracker, 'upload_async'):
+                        return await tracker.upload_async(torrent_path, description, metadata)
+                    return await loop.run_in_executor(
+                        None, tracker.upload, torrent_path, description, metadata
+                    )
+                except Exception as e:
+                    logger.error("Exception during %s upload: %s", tracker_id, e)
+                    return False, f"Exception during {tracker_id} upload: {e}"
+        
+        results = await asyncio.gather(*(upload_one(tracker_id) for tracker_id in tracker_ids))
+        return dict(zip(tracker_ids, results))
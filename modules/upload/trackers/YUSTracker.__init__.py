@@ -1,6 +0,0 @@
-"""
-modules.upload.trackers package for Music-Upload-Assistant.
-"""
-self.upload_url = 'https://yu-scene.net/api/torrents/upload'
-self.config     = config 
-
@@ -4,18 +4,186 @@ Base class for implementing common tracker functionality.
 """
 
 import os
+import re
+import math
+import time
+import random
 import requests
 import logging
 import shutil
+import secrets
+import tempfile
 import json
+import asyncio
+import functools
+import contextlib
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urljoin
-from typing import Dict, Any, Tuple, Optional
+from typing import Dict, Any, Iterator, List, Tuple, Optional
+
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 logger = logging.getLogger(__name__)
 
+try:
+    from requests_toolbelt.multipart.encoder import MultipartEncoder
+    TOOLBELT_AVAILABLE = True
+except ImportError:
+    logger.debug("requests-toolbelt not installed. Multipart uploads will be buffered in memory.")
+    TOOLBELT_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    logger.debug("orjson not installed. Tracker responses will be parsed with the json module.")
+    ORJSON_AVAILABLE = False
+
+# Start of a bencoded dictionary: 'd' followed by the first key's length
+_TORRENT_HEAD_RE = re.compile(rb'd\d+:')
+
+# "MP3" as a whole word, so names like "MP320" are left alone
+_MP3_RE = re.compile(r'\bMP3\b')
+
+# Upload responses that mean the tracker turned the request away without
+# processing it, so sending the upload again can't create a duplicate
+_RETRY_STATUSES = (429, 503)
+
+# Cover image MIME types by lowercased file extension
+_MIME_BY_EXT = {
+    '.jpg': 'image/jpeg',
+    '.jpeg': 'image/jpeg',
+    '.png': 'image/png',
+    '.gif': 'image/gif',
+}
+
+
+@functools.lru_cache(maxsize=16)
+def _read_file_cached(path: str, mtime_ns: int, size: int) -> bytes:
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def read_file_cached(path: str) -> bytes:
+    """
+    Read a file's bytes, reusing them while the file is unchanged.
+    
+    Mediainfo dumps are read once per upload and tracker; keying the cache
+    on modification time and size means a rewritten file is picked up on
+    the next call.
+    
+    Args:
+        path: Path to the file
+        
+    Returns:
+        bytes: File contents
+    """
+    st = os.stat(path)
+    return _read_file_cached(path, st.st_mtime_ns, st.st_size)
+
+
+def parse_json(response: requests.Response) -> Any:
+    """
+    Decode a JSON response body, using orjson when it is installed.
+    
+    Args:
+        response: Response object from request
+        
+    Returns:
+        object: Decoded JSON
+        
+    Raises:
+        ValueError: If the body is not valid JSON
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.loads(response.content)
+    return response.json()
+
+
+def create_session(headers: Dict[str, str]) -> requests.Session:
+    """
+    Create an HTTP session with a pooled, keep-alive adapter.
+    
+    Connections to the tracker are reused across uploads instead of
+    repeating the TCP and TLS handshake each time. Only failed connects are
+    retried, with backoff: nothing has been sent yet, so an upload can't go
+    out twice. Status codes such as 429 are not retried here (urllib3 never
+    replays a POST on a status); ``GenericTracker._do_upload`` handles those.
+    
+    Args:
+        headers: Default headers for every request
+        
+    Returns:
+        requests.Session: Configured session
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=16,
+        max_retries=Retry(total=3, connect=3, read=0, status=0, backoff_factor=0.5)
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update(headers)
+    return session
+
+
+def post_multipart(session: requests.Session,
+                   url: str,
+                   data: Any,
+                   files: Dict[str, Any],
+                   headers: Optional[Dict[str, str]] = None,
+                   **kwargs
+) -> requests.Response:
+    """
+    POST form data and files, streaming the multipart body when possible.
+    
+    With requests-toolbelt installed the body is generated from the open
+    file handles as the socket drains instead of being assembled in memory
+    first. Otherwise this is a plain ``session.post(data=..., files=...)``.
+    
+    Args:
+        session: Session to send the request on
+        url: Upload URL
+        data: Form fields (values may be lists for repeated fields)
+        files: Files as ``{field: (filename, handle, mime_type)}``
+        headers: Extra request headers
+        **kwargs: Passed through to ``session.post``
+        
+    Returns:
+        requests.Response: Response from the tracker
+    """
+    if not (TOOLBELT_AVAILABLE and files and isinstance(data, dict)):
+        return session.post(url=url, data=data, files=files, headers=headers, **kwargs)
+    
+    # Encode fields the same way requests does: lists become repeated
+    # fields, None is dropped and everything else is sent as text
+    fields = []
+    for field, value in data.items():
+        values = value if isinstance(value, (list, tuple)) else [value]
+        for item in values:
+            if item is not None:
+                fields.append((field, item if isinstance(item, (bytes, str)) else str(item)))
+    fields.extend(files.items())
+    
+    # 16 random hex characters are plenty to keep the boundary out of the
+    # payload and keep the header shorter than the default uuid4 boundary
+    encoder = MultipartEncoder(fields=fields, boundary='----MUT' + secrets.token_hex(8))
+    headers = dict(headers or {})
+    headers.setdefault('Content-Type', encoder.content_type)
+    return session.post(url=url, data=encoder, headers=headers, **kwargs)
+
+
 class GenericTracker:
     """Base class for tracker implementations."""
     
+    # Form field the tracker expects the cover image in
+    _cover_field = 'image'
+    
+    # Site URL used when the config doesn't set one
+    _default_site_url = ''
+    
     def __init__(self, config: Dict[str, Any], tracker_id: str):
         """
         Initialize the tracker.
@@ -27,6 +195,7 @@ class GenericTracker:
         self.config = config  # Store the entire config for later use
         self.tracker_id = tracker_id
         tr_cfg = config.get('trackers', {}).get(tracker_id, {})
+        self.tracker_config = tr_cfg  # Subclasses read their own settings from this
         
         # Basic configuration
         self.api_key = tr_cfg.get('api_key', '').strip()
@@ -34,9 +203,21 @@ class GenericTracker:
         self.password = tr_cfg.get('password', '').strip()
         self.upload_url = tr_cfg.get('upload_url', '').strip()
         self.announce_url = tr_cfg.get('announce_url', '').strip()
-        self.site_url = tr_cfg.get('url', '').strip()
+        self.site_url = tr_cfg.get('url', self._default_site_url).strip()
         self.use_api = bool(tr_cfg.get('use_api', 'api' in self.upload_url.lower()))
         self.anon = bool(tr_cfg.get('anon', False))
+        self.max_torrent_bytes = int(tr_cfg.get('max_torrent_bytes', 10 * 1024 * 1024))
+        
+        # (connect, read) timeouts for uploads; a dead host fails fast while a
+        # slow tracker still gets time to process the upload
+        self.timeout = (float(tr_cfg.get('connect_timeout', 10)), float(tr_cfg.get('read_timeout', 60)))
+        self.upload_retries = int(tr_cfg.get('upload_retries', 2))
+        
+        # Full upload endpoint; relative upload URLs are resolved against the site
+        if self.upload_url.startswith(('http://', 'https://')):
+            self.resolved_upload_url = self.upload_url
+        else:
+            self.resolved_upload_url = urljoin(self.site_url, self.upload_url)
         
         # Get tracker-specific settings
         self.cat_ids = tr_cfg.get('category_ids', {})
@@ -46,8 +227,7 @@ class GenericTracker:
         self.debug_mode = config.get('debug', False)
         
         # Set up HTTP session
-        self.session = requests.Session()
-        self.session.headers.update({
+        self.session = create_session({
             'User-Agent': f"Music-Upload-Assistant/{config.get('app_version', '0.2.0')}",
             'Referer': self.site_url,
             'Origin': self.site_url
@@ -58,12 +238,13 @@ class GenericTracker:
     
     def _log_config(self):
         """Log tracker configuration for debugging."""
-        logger.info(f"[{self.tracker_id} CONFIG] " 
-                   f"api_key={'SET' if self.api_key else 'MISSING'}, "
-                   f"username={'SET' if self.username else 'MISSING'}, "
-                   f"upload_url={self.upload_url or 'MISSING'}, "
-                   f"site_url={self.site_url or 'MISSING'}, "
-                   f"use_api={self.use_api}")
+        logger.info("[%s CONFIG] api_key=%s, username=%s, upload_url=%s, site_url=%s, use_api=%s",
+                    self.tracker_id,
+                    'SET' if self.api_key else 'MISSING',
+                    'SET' if self.username else 'MISSING',
+                    self.upload_url or 'MISSING',
+                    self.site_url or 'MISSING',
+                    self.use_api)
     
     def is_configured(self) -> bool:
         """
@@ -86,18 +267,50 @@ class GenericTracker:
         
         return True
     
-    def _prepare_cover_image(self, metadata: Dict[str, Any]) -> Optional[str]:
+    def _check_torrent_file(self, torrent_path: str) -> Optional[str]:
         """
-        Prepare cover image for upload.
+        Check that the torrent file can be uploaded.
+        
+        Catches the cheap cases the tracker would reject anyway (missing,
+        empty, over the size limit, not bencoded) before any cover
+        preparation or network I/O.
         
         Args:
-            metadata: Track or album metadata
+            torrent_path: Path to torrent file
             
         Returns:
-            str: Path to prepared cover image or None if not found
+            str: Error message, or None if the file is usable
         """
-        cover_path = None
+        try:
+            st = os.stat(torrent_path)
+        except OSError:
+            return f"Torrent file not found: {torrent_path}"
+        if not st.st_size:
+            return f"Torrent file is empty: {torrent_path}"
+        if st.st_size > self.max_torrent_bytes:
+            return (f"Torrent file is too large: {torrent_path} "
+                    f"({st.st_size} bytes, limit {self.max_torrent_bytes})")
+        
+        # A torrent is a bencoded dictionary: 'd' then the first key's length
+        try:
+            with open(torrent_path, 'rb') as f:
+                head = f.read(16)
+        except OSError as e:
+            return f"Could not read torrent file {torrent_path}: {e}"
+        if not _TORRENT_HEAD_RE.match(head):
+            return f"Not a valid torrent file: {torrent_path}"
+        return None
+    
+    def _find_cover_image(self, metadata: Dict[str, Any]) -> Optional[str]:
+        """
+        Find the source cover image for an upload.
         
+        Args:
+            metadata: Track or album metadata
+            
+        Returns:
+            str: Path to cover image or None if not found
+        """
         # Check for paths to artwork in this priority order
         possible_paths = [
             metadata.get('artwork_path'),
@@ -107,30 +320,55 @@ class GenericTracker:
         # Find first valid path
         for path in possible_paths:
             if path and os.path.exists(path):
-                cover_path = path
-                break
+                return path
+        
+        logger.warning("No cover image found in metadata")
+        return None
+    
+    def _cover_work_dir(self) -> tempfile.TemporaryDirectory:
+        """
+        Create a private directory for preparing one upload's cover image.
         
+        The directory and everything in it is removed when the returned
+        object's ``with`` block exits, so prepared covers never pile up in
+        the temp directory.
+        
+        Returns:
+            TemporaryDirectory: Directory under <temp_dir>/cover_prep
+        """
+        cover_root = os.path.join(self.config.get('temp_dir', 'temp'), 'cover_prep')
+        os.makedirs(cover_root, exist_ok=True)
+        return tempfile.TemporaryDirectory(prefix=f"{self.tracker_id.lower()}_", dir=cover_root)
+    
+    def _prepare_cover_image(self, metadata: Dict[str, Any], work_dir: str) -> Optional[str]:
+        """
+        Prepare cover image for upload.
+        
+        Args:
+            metadata: Track or album metadata
+            work_dir: Directory for the prepared image, from _cover_work_dir
+            
+        Returns:
+            str: Path to prepared cover image or None if not found
+        """
+        cover_path = self._find_cover_image(metadata)
         if not cover_path:
-            logger.warning("No cover image found in metadata")
             return None
-            
-        # Create a temporary directory for cover preparation if needed
-        temp_dir = os.path.join(self.config.get('temp_dir', 'temp'), 'cover_prep')
-        os.makedirs(temp_dir, exist_ok=True)
         
         # Copy and ensure proper format for tracker
         try:
-            # Prepare image file
-            output_path = os.path.join(temp_dir, "cover.jpg")
+            # Prepare image file. work_dir belongs to this upload alone, so
+            # the copy can't race another upload and is cleaned up with it
+            output_path = os.path.join(work_dir, "cover.jpg")
             
             # Simple file copy for now
             # In the future could add resizing/conversion using PIL if needed
             shutil.copy2(cover_path, output_path)
-            logger.info(f"Prepared cover image for upload: {output_path}")
+            logger.info("Prepared cover image for upload: %s", output_path)
             
             return output_path
         except Exception as e:
-            logger.error(f"Error preparing cover image: {e}")
+            logger.error("Error preparing cover image: %s", e)
             return cover_path  # Return original path as fallback
     
     def _create_upload_name(self, metadata: Dict[str, Any]) -> str:
@@ -170,6 +408,21 @@ class GenericTracker:
         
         return upload_name
     
+    def _fix_format_mismatch(self, upload_name: str) -> str:
+        """
+        Replace a stray MP3 tag in the name of a FLAC release with FLAC.
+        
+        Args:
+            upload_name: Release name for a FLAC upload
+            
+        Returns:
+            str: Release name naming the right format
+        """
+        fixed_name = _MP3_RE.sub('FLAC', upload_name)
+        if fixed_name != upload_name:
+            logger.info("Fixed format mismatch in release name: %s", fixed_name)
+        return fixed_name
+    
     def _build_form_data(self, metadata: Dict[str, Any], description: str) -> Dict[str, Any]:
         """
         Build form data for the tracker upload.
@@ -188,47 +441,95 @@ class GenericTracker:
             'anonymous': "1" if self.anon else "0"
         }
     
-    def _build_file_payload(self, torrent_path: str, cover_path: Optional[str] = None) -> Dict[str, Any]:
+    def _describe_payload(self,
+                          torrent_path: str,
+                          cover_path: Optional[str] = None,
+                          cover_field: str = 'image'
+    ) -> Dict[str, str]:
         """
-        Build file payload for the tracker upload.
+        Describe the files an upload would send, without opening them.
         
         Args:
             torrent_path: Path to torrent file
             cover_path: Path to cover image
+            cover_field: Form field name for the cover image
             
         Returns:
-            dict: Files for upload
+            dict: File path for each form field
         """
-        files = {
-            'torrent': (
-                os.path.basename(torrent_path),
-                open(torrent_path, 'rb'),
-                'application/x-bittorrent'
-            )
-        }
-        
-        # Add cover file to upload if found
+        files = {'torrent': torrent_path}
         if cover_path and os.path.exists(cover_path):
-            try:
-                cover_file_handle = open(cover_path, 'rb')
-                mime_type = 'image/jpeg'  # Default to jpeg
-                if cover_path.lower().endswith('.png'):
-                    mime_type = 'image/png'
-                elif cover_path.lower().endswith('.gif'):
-                    mime_type = 'image/gif'
-                    
-                files['image'] = (  # Most trackers use 'image' as the field name
-                    os.path.basename(cover_path),
-                    cover_file_handle,
-                    mime_type
+            files[cover_field] = cover_path
+        return files
+    
+    @contextlib.contextmanager
+    def _open_payload(self,
+                      torrent_path: str,
+                      cover_path: Optional[str] = None,
+                      cover_field: str = 'image'
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Open the torrent and cover files for upload.
+        
+        The handles are closed when the ``with`` block exits, whether the
+        upload succeeded or raised. Both files are streamed from disk during
+        the multipart post rather than held in memory. The cover is the
+        upload's own prepared copy, so it is not read through
+        read_file_cached: that would keep up to 16 whole covers in memory,
+        against the point of streaming, and the entries would be dead once
+        the copy is removed. The price is that each tracker upload reads
+        the cover from disk again.
+        
+        Args:
+            torrent_path: Path to torrent file
+            cover_path: Path to cover image
+            cover_field: Form field name for the cover image
+            
+        Yields:
+            dict: Files for upload
+        """
+        with contextlib.ExitStack() as stack:
+            files = {
+                'torrent': (
+                    os.path.basename(torrent_path),
+                    stack.enter_context(open(torrent_path, 'rb')),
+                    'application/x-bittorrent'
                 )
-                logger.info(f"Added cover art to tracker upload request: {cover_path}")
-            except Exception as e:
-                logger.error(f"Error adding cover to upload: {e}")
-                if 'cover_file_handle' in locals():
-                    cover_file_handle.close()
+            }
+            
+            # Add cover file to upload if found
+            if cover_path:
+                try:
+                    cover_file_handle = stack.enter_context(open(cover_path, 'rb'))
+                    ext = os.path.splitext(cover_path)[1].lower()
+                    mime_type = _MIME_BY_EXT.get(ext, 'image/jpeg')  # Default to jpeg
+                    
+                    files[cover_field] = (
+                        os.path.basename(cover_path),
+                        cover_file_handle,
+                        mime_type
+                    )
+                    logger.info("Added cover art to tracker upload request: %s", cover_path)
+                except FileNotFoundError:
+                    logger.debug("Cover image not found: %s", cover_path)
+                except Exception as e:
+                    logger.error("Error adding cover to upload: %s", e)
+            
+            yield files
+    
+    def _post_multipart(self,
+                        url: str,
+                        data: Any,
+                        files: Dict[str, Any],
+                        headers: Optional[Dict[str, str]] = None,
+                        **kwargs
+    ) -> requests.Response:
+        """
+        POST form data and files on this tracker's session.
         
-        return files
+        See ``post_multipart``.
+        """
+        return post_multipart(self.session, url, data, files, headers, **kwargs)
     
     def upload(self,
                torrent_path: str,
@@ -249,66 +550,267 @@ class GenericTracker:
         # Preconditions
         if not self.is_configured():
             return False, f"Tracker {self.tracker_id} not configured"
-        if not os.path.exists(torrent_path):
-            return False, f"Torrent file not found: {torrent_path}"
-        
-        # Prepare cover art
-        cover_path = self._prepare_cover_image(metadata)
+        error = self._check_torrent_file(torrent_path)
+        if error:
+            return False, error
         
         # Build form data
         data = self._build_form_data(metadata, description)
         
-        # Build file payload
-        files = self._build_file_payload(torrent_path, cover_path)
-        
-        # Debug mode: just print what would happen
+        # Debug mode: just print what would happen, without preparing the cover
         if self.debug_mode:
-            logger.info(f"=== DEBUG MODE {self.tracker_id} UPLOAD ===")
-            logger.info(f"POST URL: {self.upload_url}")
-            logger.info(f"DATA: {data}")
-            logger.info(f"FILES: {list(files.keys())}")
-            # Close file handles
-            for _, f in files.items():
-                try:
-                    f[1].close()
-                except:
-                    pass
+            logger.info("=== DEBUG MODE %s UPLOAD ===", self.tracker_id)
+            logger.info("POST URL: %s", self.upload_url)
+            logger.info("DATA: %s", data)
+            logger.info("FILES: %s", self._describe_payload(torrent_path, self._find_cover_image(metadata)))
             return True, f"Debug mode: {self.tracker_id} upload simulation successful"
         
-        # Actual upload - subclasses should implement this
-        logger.warning(f"Generic upload not implemented for {self.tracker_id}")
+        # Prepare cover art
+        with self._cover_work_dir() as work_dir:
+            cover_path = self._prepare_cover_image(metadata, work_dir)
+            
+            # Actual upload - subclasses should implement this
+            logger.warning("Generic upload not implemented for %s", self.tracker_id)
+        
+        return False, "Upload not implemented in generic tracker"
+    
+    def _build_auth(self, data: Dict[str, Any]) -> Tuple[Dict[str, str], Dict[str, str]]:
+        """
+        Build the authentication for an upload request.
+        Override this if your tracker authenticates uploads; it may also add
+        fields to the form data.
+        
+        Args:
+            data: Form data for the upload
+            
+        Returns:
+            tuple: (query params, request headers)
+        """
+        return {}, {}
+    
+    def _parse_upload_response(self, response: requests.Response) -> Tuple[bool, str]:
+        """
+        Turn the tracker's response to an upload into a result.
+        Override this if your tracker reports results differently.
         
-        # Close file handles before returning
-        for _, f in files.items():
+        Args:
+            response: Response object from the upload request
+            
+        Returns:
+            tuple: (success, message)
+        """
+        # Decode the body once; the error and success paths share it
+        result = None
+        if 'application/json' in response.headers.get('Content-Type', ''):
             try:
-                f[1].close()
-            except:
-                pass
+                result = parse_json(response)
+            except ValueError as e:
+                if response.ok:
+                    logger.warning("Could not parse success response: %s", e)
         
-        return False, "Upload not implemented in generic tracker"
+        if not response.ok:
+            return False, self._handle_error_response(response, result)
+        
+        if isinstance(result, dict):
+            if result.get('success'):
+                return True, result.get('message', f'{self.tracker_id} upload successful')
+            if 'message' in result:
+                return True, result['message']
+        
+        return True, f"{self.tracker_id} upload successful"
     
-    def _handle_error_response(self, response) -> str:
+    def _do_upload(self,
+                   torrent_path: str,
+                   description: str,
+                   metadata: Dict[str, Any],
+                   **form_options
+    ) -> Tuple[bool, str]:
+        """
+        Run the upload pipeline shared by the API trackers.
+        
+        Checks the torrent, builds the form with ``_build_form_data`` and the
+        auth with ``_build_auth``, streams the payload to the resolved upload
+        URL and hands the response to ``_parse_upload_response``.
+        
+        Args:
+            torrent_path: Path to torrent file
+            description: Release description
+            metadata: Track or album metadata
+            **form_options: Extra arguments for ``_build_form_data``
+            
+        Returns:
+            tuple: (success, message)
+        """
+        # Preconditions
+        if not self.is_configured():
+            return False, f"{self.tracker_id} tracker not configured"
+        error = self._check_torrent_file(torrent_path)
+        if error:
+            return False, error
+        
+        # Build form data
+        data = self._build_form_data(metadata, description, **form_options)
+        
+        # Debug mode: just print what would happen, without preparing the cover
+        if self.debug_mode:
+            logger.info("=== DEBUG MODE %s UPLOAD ===", self.tracker_id)
+            logger.info("POST URL: %s", self.resolved_upload_url)
+            
+            # Log API key info
+            if self.api_key:
+                logger.info("API Token: %s****", self.api_key[:4])
+            
+            logger.info("DATA: %s", data)
+            logger.info("FILES: %s", self._describe_payload(
+                torrent_path, self._find_cover_image(metadata), self._cover_field))
+            
+            return True, f"Debug mode: {self.tracker_id} upload simulation successful"
+        
+        # Prepare upload endpoint and authentication
+        upload_url = self.resolved_upload_url
+        params, headers = self._build_auth(data)
+        
+        # Perform the upload
+        try:
+            # The prepared cover lives only as long as this upload
+            with self._cover_work_dir() as work_dir:
+                cover_path = self._prepare_cover_image(metadata, work_dir)
+                
+                logger.info("Uploading torrent to %s at %s", self.tracker_id, upload_url)
+                
+                for attempt in range(self.upload_retries + 1):
+                    # The payload is reopened for each attempt; a sent stream
+                    # can't be replayed
+                    with self._open_payload(torrent_path, cover_path, self._cover_field) as files:
+                        response = self._post_multipart(
+                            upload_url,
+                            data,
+                            files,
+                            headers=headers,
+                            params=params,
+                            timeout=self.timeout
+                        )
+                    
+                    if response.status_code not in _RETRY_STATUSES or attempt == self.upload_retries:
+                        break
+                    
+                    delay = self._retry_delay(response, attempt)
+                    logger.warning("%s returned %d, retrying upload in %.1fs",
+                                   self.tracker_id, response.status_code, delay)
+                    time.sleep(delay)
+            
+            return self._parse_upload_response(response)
+            
+        except Exception as e:
+            logger.error("Exception during %s upload: %s", self.tracker_id, e)
+            return False, f"Exception during {self.tracker_id} upload: {e}"
+    
+    @staticmethod
+    def _retry_delay(response: requests.Response, attempt: int) -> float:
+        """
+        Seconds to wait before retrying a turned-away upload.
+        
+        Honours a Retry-After given in seconds, otherwise backs off
+        exponentially with jitter so parallel uploads don't retry in step.
+        
+        Args:
+            response: Response that asked for the retry
+            attempt: Number of the attempt that failed, from 0
+            
+        Returns:
+            float: Delay in seconds
+        """
+        retry_after = response.headers.get('Retry-After', '')
+        if retry_after.isdigit():
+            return min(float(retry_after), 60.0)
+        return min(0.5 * 2 ** attempt, 30.0) + random.uniform(0, 0.5)
+    
+    def _upload_slots(self) -> int:
+        """
+        Number of uploads to run at once, sized from the upstream bandwidth.
+        
+        Follows the usual torrent-client rule of sqrt(rate * 0.6) slots for a
+        rate in KB/s, capped at 6; an unlimited rate gets the cap.
+        
+        Returns:
+            int: Number of concurrent uploads
+        """
+        try:
+            rate = float(self.config.get('upload', {}).get('upload_rate_kbs', -1))
+        except (TypeError, ValueError):
+            rate = -1  # Missing or malformed: treat as unlimited
+        if rate <= 0:
+            return 6
+        return min(6, int(math.sqrt(max(rate, 42) * 0.6)))
+    
+    def upload_many(self, jobs: List[Tuple[str, str, Dict[str, Any]]]) -> List[Tuple[bool, str]]:
+        """
+        Upload several torrents to this tracker concurrently.
+        
+        The session's connection pool is shared by the worker threads.
+        
+        Args:
+            jobs: (torrent_path, description, metadata) for each upload
+            
+        Returns:
+            list: (success, message) for each job, in order
+        """
+        if len(jobs) <= 1:
+            return [self.upload(*job) for job in jobs]
+        
+        with ThreadPoolExecutor(max_workers=min(self._upload_slots(), len(jobs))) as pool:
+            return list(pool.map(lambda job: self.upload(*job), jobs))
+    
+    async def upload_async(self,
+                           torrent_path: str,
+                           description: str,
+                           metadata: Dict[str, Any]
+    ) -> Tuple[bool, str]:
+        """
+        Upload a torrent to the tracker without blocking the event loop.
+        
+        The upload runs on the loop's default executor, so uploads to several
+        trackers can be awaited together (e.g. with ``asyncio.gather``) and
+        overlap on the network.
+        
+        Args:
+            torrent_path: Path to torrent file
+            description: Release description
+            metadata: Track or album metadata
+            
+        Returns:
+            tuple: (success, message)
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None,
+            functools.partial(self.upload, torrent_path, description, metadata)
+        )
+    
+    def _handle_error_response(self, response, data: Any = None) -> str:
         """
         Handle error responses from the tracker.
         
         Args:
             response: Response object from request
+            data: Response body already decoded by the caller, if any
             
         Returns:
             str: Error message
         """
-        error_message = f"{response.status_code} - {response.text[:200]}"
+        error_message = f"{response.status_code} - {response.content[:200].decode('utf-8', errors='replace')}"
         
         # Try to parse JSON responses
-        if 'application/json' in response.headers.get('Content-Type', ''):
+        if data is None and 'application/json' in response.headers.get('Content-Type', ''):
             try:
-                data = response.json()
-                if isinstance(data, dict):
-                    if 'error' in data:
-                        error_message = data['error']
-                    elif 'message' in data:
-                        error_message = data['message']
+                data = parse_json(response)
             except Exception as e:
-                logger.warning(f"Could not parse JSON error response: {e}")
+                logger.warning("Could not parse JSON error response: %s", e)
+        
+        if isinstance(data, dict):
+            if 'error' in data:
+                error_message = data['error']
+            elif 'message' in data:
+                error_message = data['message']
         
         return error_message
@@ -4,19 +4,36 @@ Handles uploading to the SP tracker.
 """
 
 import os
-import requests
 import logging
-import json
-from urllib.parse import urljoin
-from typing import Dict, Any, Tuple, Optional
+from typing import Dict, Any, Tuple
 
-from modules.upload.trackers.generic_tracker import GenericTracker
+from modules.upload.trackers.generic_tracker import GenericTracker, parse_json, read_file_cached
 
 logger = logging.getLogger(__name__)
 
+# Form fields SP requires that are the same for every music upload
+_SP_STATIC_DATA = {
+    'tmdb': '0',  # Required field but not relevant for music
+    'imdb': '0',  # Required field but not relevant for music
+    'tvdb': '0',  # Required field but not relevant for music
+    'mal': '0',   # Required field but not relevant for music
+    'igdb': '0',  # Required field but not relevant for music
+    'stream': '0',  # No stream for music
+    'sd': '0',      # Not SD content
+    'personal_release': '0',
+    'internal': '0',
+    'featured': '0',
+    'free': '0',
+    'doubleup': '0',
+    'sticky': '0'
+}
+
 class SPTracker(GenericTracker):
     """Tracker implementation for SP."""
     
+    # SP takes the cover in the 'torrent_cover' field (UNIT3D standard)
+    _cover_field = 'torrent_cover'
+    
     def __init__(self, config: Dict[str, Any]):
         """
         Initialize the SP tracker.
@@ -27,7 +44,7 @@ class SPTracker(GenericTracker):
         super().__init__(config, "SP")
         
         # Get SP-specific configuration
-        sp_config = config.get('trackers', {}).get('SP', {})
+        sp_config = self.tracker_config
         
         # Configure SP-specific settings
         self.api_auth_type = sp_config.get('api_auth_type', 'bearer')  # 'bearer', 'token', 'param'
@@ -37,8 +54,18 @@ class SPTracker(GenericTracker):
         self.category_endpoint = sp_config.get('category_endpoint', '')
         self.format_endpoint = sp_config.get('format_endpoint', '')
         
+        # Lookup tables used for every upload; config doesn't change after load
+        self._format_ids = {k.upper(): v for k, v in self.format_ids.items()}
+        self._category_ids = {k.upper(): v for k, v in self.cat_ids.items()}
+        resolution_ids = {k.upper(): v for k, v in sp_config.get('resolution_ids', {}).items()}
+        self._resolution_id = resolution_ids.get('OTHER', '10')  # SP requires one; music is 'OTHER'
+        self.max_mediainfo_bytes = int(sp_config.get('max_mediainfo_bytes', 256 * 1024))
+        
+        # Set User-Agent header according to SP.py example, once per session
+        self.session.headers['User-Agent'] = f'Music-Upload-Tool/{config.get("app_version", "1.0.0")}'
+        
         # Log configuration
-        logger.info(f"[SP CONFIG] Initialized with API auth type: {self.api_auth_type}")
+        logger.info("[SP CONFIG] Initialized with API auth type: %s", self.api_auth_type)
     
     def is_configured(self) -> bool:
         """
@@ -72,70 +99,61 @@ class SPTracker(GenericTracker):
         format_type = metadata.get('format', 'FLAC').upper()
         
         # Get format ID based on SP's requirements
-        tr_cfg = self.config.get('trackers', {}).get('SP', {})
-        format_ids = tr_cfg.get('format_ids', {})
-        type_id = format_ids.get(format_type, '1')  # Default to 1 (DISC) if not found
-        logger.info(f"Using type_id: {type_id} for format: {format_type} on SP")
+        type_id = self._format_ids.get(format_type, '1')  # Default to 1 (DISC) if not found
+        logger.info("Using type_id: %s for format: %s on SP", type_id, format_type)
         
         # Get resolution ID (required by SP) - default to 'OTHER'
-        resolution_ids = tr_cfg.get('resolution_ids', {})
-        resolution_id = resolution_ids.get('OTHER', '10')
+        resolution_id = self._resolution_id
         
         # Get category ID based on the release type (album, single, etc.)
-        # Check the configured category IDs from the tracker config
         release_type = metadata.get('release_type', 'ALBUM').upper()
-        tr_cfg = self.config.get('trackers', {}).get('SP', {})
-        category_ids = tr_cfg.get('category_ids', {})
         
         # Use the category ID for the release type, defaulting to '1' (MOVIE) if not found
-        category_id = category_ids.get(release_type, '1')  
-        logger.info(f"Using category_id: {category_id} for {release_type} music content on SP")
+        category_id = self._category_ids.get(release_type, '1')
+        logger.info("Using category_id: %s for %s music content on SP", category_id, release_type)
         
         # Create upload name, ensuring format matches actual file format
         upload_name = self._create_upload_name(metadata)
-        if format_type == 'FLAC' and ' MP3' in upload_name:
-            upload_name = upload_name.replace(' MP3', ' FLAC')
-            logger.info(f"Fixed format mismatch in release name: {upload_name}")
+        if format_type == 'FLAC':
+            upload_name = self._fix_format_mismatch(upload_name)
+        
+        # Keywords are the genres plus the album name. Copy the genres so the
+        # caller's metadata isn't modified (it is shared across trackers).
+        genres = metadata.get('genres')
+        keywords = list(genres) if isinstance(genres, list) else []
+        album = metadata.get('album')
+        if album:
+            keywords.append(album)
         
         # Build the form data based on SP.py requirements
-        data = {
+        data = _SP_STATIC_DATA.copy()
+        data.update({
             'name': upload_name,
             'description': description,
             'category_id': category_id,
             'type_id': type_id,
             'resolution_id': resolution_id,
-            'tmdb': '0',  # Required field but not relevant for music
-            'imdb': '0',  # Required field but not relevant for music
-            'tvdb': '0',  # Required field but not relevant for music
-            'mal': '0',   # Required field but not relevant for music
-            'igdb': '0',  # Required field but not relevant for music
             'anonymous': "1" if self.anon else "0",
-            'stream': '0',  # No stream for music 
-            'sd': '0',      # Not SD content
-            'keywords': metadata.get('genres', []) if isinstance(metadata.get('genres', []), list) else [],
-            'personal_release': '0',
-            'internal': '0',
-            'featured': '0',
-            'free': '0',
-            'doubleup': '0',
-            'sticky': '0'
-        }
+            'keywords': keywords
+        })
         
         # Try to get mediainfo if available
         if 'mediainfo_path' in metadata and os.path.exists(metadata['mediainfo_path']):
             try:
-                with open(metadata['mediainfo_path'], 'r', encoding='utf-8') as f:
-                    data['mediainfo'] = f.read()
+                mediainfo_path = metadata['mediainfo_path']
+                if os.path.getsize(mediainfo_path) > self.max_mediainfo_bytes:
+                    # Only send the head of pathologically large dumps
+                    with open(mediainfo_path, 'rb') as f:
+                        raw = f.read(self.max_mediainfo_bytes)
+                    logger.warning("Mediainfo %s truncated to %d bytes", mediainfo_path, len(raw))
+                    mediainfo = raw.decode('utf-8', errors='ignore')
+                else:
+                    mediainfo = read_file_cached(mediainfo_path).decode('utf-8')
+                # Normalize line endings as a text-mode read would
+                data['mediainfo'] = mediainfo.replace('\r\n', '\n').replace('\r', '\n')
             except Exception as e:
-                logger.error(f"Error reading mediainfo: {e}")
+                logger.error("Error reading mediainfo: %s", e)
         
-        # Extract available metadata fields
-        if 'album' in metadata:
-            # For SP, add album info to description or keywords
-            album = metadata.get('album', '')
-            if album and 'keywords' in data and isinstance(data['keywords'], list):
-                data['keywords'].append(album)
-                
         return data
     
     def upload(self,
@@ -154,145 +172,70 @@ class SPTracker(GenericTracker):
         Returns:
             tuple: (success, message)
         """
-        # Preconditions
-        if not self.is_configured():
-            return False, "SP tracker not configured"
-        if not os.path.exists(torrent_path):
-            return False, f"Torrent file not found: {torrent_path}"
-        
-        # Prepare cover art
-        cover_path = self._prepare_cover_image(metadata)
-        
-        # Build form data
-        data = self._build_form_data(metadata, description)
-        
-        # Build file payload - SP expects only the torrent file
-        files = {
-            'torrent': (
-                os.path.basename(torrent_path),
-                open(torrent_path, 'rb'),
-                'application/x-bittorrent'
-            )
-        }
-        
-        # Add cover image if available - use 'torrent_cover' field name (UNIT3D standard)
-        if cover_path and os.path.exists(cover_path):
-            files['torrent_cover'] = (
-                os.path.basename(cover_path),
-                open(cover_path, 'rb'),
-                'image/jpeg' if cover_path.lower().endswith('.jpg') or cover_path.lower().endswith('.jpeg') else 'image/png'
-            )
-            logger.info(f"Added cover art using field name 'torrent_cover': {cover_path}")
+        return self._do_upload(torrent_path, description, metadata)
+    
+    def _build_auth(self, data: Dict[str, Any]) -> Tuple[Dict[str, str], Dict[str, str]]:
+        """
+        Build the authentication for an SP upload.
         
-        # Debug mode: just print what would happen
-        if self.debug_mode:
-            logger.info("=== DEBUG MODE SP UPLOAD ===")
-            logger.info(f"POST URL: {self.upload_url}")
-            
-            # Log API key or token info if present
-            if self.api_key:
-                logger.info(f"API Token: {self.api_key[:4]}****")
-            
-            logger.info(f"DATA: {data}")
-            logger.info(f"FILES: {list(files.keys())}")
-            
-            # Close file handles
-            for _, f in files.items():
-                try:
-                    f[1].close()
-                except:
-                    pass
+        Args:
+            data: Form data for the upload
             
-            return True, "Debug mode: SP upload simulation successful"
-        
-        # Prepare upload endpoint
-        upload_url = self.upload_url
-        
-        # If URL doesn't look like a full API endpoint, construct it
-        if not upload_url.startswith('http'):
-            upload_url = urljoin(self.site_url, upload_url)
-        
+        Returns:
+            tuple: (query params, request headers)
+        """
         # Add API token as URL parameter (following SP.py example)
-        params = {
-            'api_token': self.api_key.strip()
-        }
-        
-        # Set User-Agent header according to SP.py example
-        headers = {
-            'User-Agent': f'Music-Upload-Tool/{self.config.get("app_version", "1.0.0")}'
-        }
+        return {'api_token': self.api_key}, {}
+    
+    def _parse_upload_response(self, response) -> Tuple[bool, str]:
+        """
+        Turn SP's response to an upload into a result.
         
-        # Perform the upload
-        try:
-            logger.info(f"Uploading torrent to SP at {upload_url}")
-            
-            # Execute the upload request with params and form data
-            response = self.session.post(
-                url=upload_url,
-                params=params,
-                headers=headers,
-                data=data,
-                files=files,
-                timeout=60
-            )
-            
-            # Close file handles
-            for _, f in files.items():
-                try:
-                    f[1].close()
-                except:
-                    pass
-            
-            # Process the response
-            if not response.ok:
-                # Try to parse error response as JSON
-                try:
-                    error_data = response.json()
-                    if 'message' in error_data:
-                        error_message = error_data['message']
-                        # If there are validation errors, include them in detail
-                        if 'errors' in error_data:
-                            for field, errors in error_data['errors'].items():
-                                if isinstance(errors, list):
-                                    error_message += f"\n- {field}: {', '.join(errors)}"
-                                else:
-                                    error_message += f"\n- {field}: {errors}"
-                        return False, error_message
-                except Exception:
-                    # Fallback to generic error handling
-                    error_message = self._handle_error_response(response)
-                    return False, error_message
+        Args:
+            response: Response object from the upload request
             
-            # Try to parse success response
+        Returns:
+            tuple: (success, message)
+        """
+        # Decode the body once; the error and success paths share it
+        result = None
+        if not response.ok or 'application/json' in response.headers.get('Content-Type', ''):
             try:
-                if 'application/json' in response.headers.get('Content-Type', ''):
-                    result = response.json()
-                    if isinstance(result, dict):
-                        # Check for various success indicators
-                        if 'success' in result and result['success']:
-                            # Extract success message if available
-                            message = result.get('message', 'SP upload successful')
-                            # If there's a data field with a torrent ID, include it
-                            if 'data' in result:
-                                message += f" - Torrent ID: {result['data']}"
-                            return True, message
-                        elif 'message' in result:
-                            return True, result['message']
-                        elif 'data' in result:
-                            return True, f"SP upload successful - {result['data']}"
-            except Exception as e:
-                logger.warning(f"Could not parse success response: {e}")
-            
-            # Default success
-            return True, "SP upload successful"
-            
-        except Exception as e:
-            # Close file handles on exception
-            for _, f in files.items():
-                try:
-                    f[1].close()
-                except:
-                    pass
+                result = parse_json(response)
+            except ValueError as e:
+                if response.ok:
+                    logger.warning("Could not parse success response: %s", e)
+        
+        # Process the response
+        if not response.ok:
+            if isinstance(result, dict) and 'message' in result:
+                error_message = result['message']
+                # If there are validation errors, include them in detail
+                errors = result.get('errors')
+                if isinstance(errors, dict):
+                    error_message = '\n- '.join([error_message] + [
+                        f"{field}: {', '.join(msgs) if isinstance(msgs, list) else msgs}"
+                        for field, msgs in errors.items()
+                    ])
+                return False, error_message
             
-            logger.error(f"Exception during SP upload: {e}")
-            return False, f"Exception during SP upload: {e}"
+            # Fallback to generic error handling
+            return False, self._handle_error_response(response, result)
+        
+        # Check the success response for details
+        if isinstance(result, dict):
+            # Check for various success indicators
+            if 'success' in result and result['success']:
+                # Extract success message if available
+                message = result.get('message', 'SP upload successful')
+                # If there's a data field with a torrent ID, include it
+                if 'data' in result:
+                    message += f" - Torrent ID: {result['data']}"
+                return True, message
+            elif 'message' in result:
+                return True, result['message']
+            elif 'data' in result:
+                return True, f"SP upload successful - {result['data']}"
+        
+        # Default success
+        return True, "SP upload successful"
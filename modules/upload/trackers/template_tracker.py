@@ -3,17 +3,24 @@ Template tracker module for Music-Upload-Assistant.
 Use this as a starting point for creating your own tracker implementations.
 """
 
-import os
-import requests
 import logging
-import json
-from urllib.parse import urljoin
-from typing import Dict, Any, Tuple, Optional
+from typing import Dict, Any, Tuple
 
-from modules.upload.trackers.generic_tracker import GenericTracker
+from modules.upload.trackers.generic_tracker import GenericTracker, parse_json
 
 logger = logging.getLogger(__name__)
 
+# Keys that different APIs use for their error message, in priority order
+_ERROR_KEYS = ('error', 'message', 'error_message', 'msg', 'errorMsg')
+
+# Format IDs used when the config has no mapping for a format
+_FORMAT_FALLBACKS = {
+    'FLAC': '1',
+    'MP3': '2',
+    'AAC': '3'
+    # Add more fallbacks as needed
+}
+
 class TemplateTracker(GenericTracker):
     """
     Template tracker implementation.
@@ -34,7 +41,7 @@ class TemplateTracker(GenericTracker):
         super().__init__(config, tracker_id)
         
         # Get tracker-specific configuration
-        tracker_config = config.get('trackers', {}).get(tracker_id, {})
+        tracker_config = self.tracker_config
         
         # Configure tracker-specific settings
         self.api_auth_type = tracker_config.get('api_auth_type', 'bearer')  # 'bearer', 'token', 'param'
@@ -43,8 +50,21 @@ class TemplateTracker(GenericTracker):
         # Add any other custom properties your tracker needs
         self.custom_setting = tracker_config.get('custom_setting', '')
         
+        # Lookup tables used for every upload, built once: configured format
+        # IDs override the fallbacks, and keys are upper-cased like the
+        # metadata values they're matched against
+        self._format_ids = dict(_FORMAT_FALLBACKS)
+        self._format_ids.update({k.upper(): v for k, v in self.format_ids.items() if v})
+        self._category_ids = {k.upper(): v for k, v in self.cat_ids.items()}
+        self._default_category_id = self._category_ids.get('ALBUM', '1')
+        
+        # Bearer auth (the default) is the same for every request, so set the
+        # header on the session once rather than passing it per upload
+        if self.use_api and self.api_key and self.api_auth_type not in ('param', 'token'):
+            self.session.headers['Authorization'] = f"Bearer {self.api_key}"
+        
         # Log configuration
-        logger.info(f"[{tracker_id} CONFIG] Initialized with auth type: {self.api_auth_type}")
+        logger.info("[%s CONFIG] Initialized with auth type: %s", tracker_id, self.api_auth_type)
     
     def is_configured(self) -> bool:
         """
@@ -78,22 +98,13 @@ class TemplateTracker(GenericTracker):
         # Get format type from metadata
         format_type = metadata.get('format', 'FLAC').upper()
         
-        # Determine format ID based on tracker's requirements
-        # First check if we have a mapping in the config
-        format_id = self.format_ids.get(format_type)
-        if not format_id:
-            # Fallback values
-            format_fallbacks = {
-                'FLAC': '1',
-                'MP3': '2',
-                'AAC': '3'
-                # Add more fallbacks as needed
-            }
-            format_id = format_fallbacks.get(format_type, '1')  # Default to FLAC (1) if not found
+        # Determine format ID based on tracker's requirements: the config
+        # mapping, then the fallback values
+        format_id = self._format_ids.get(format_type, '1')  # Default to FLAC (1) if not found
         
         # Determine category ID based on release type
         release_type = metadata.get('release_type', 'ALBUM').upper()
-        category_id = self.cat_ids.get(release_type, self.cat_ids.get('ALBUM', '1'))
+        category_id = self._category_ids.get(release_type, self._default_category_id)
         
         # Create upload name
         upload_name = self._create_upload_name(metadata)
@@ -126,60 +137,26 @@ class TemplateTracker(GenericTracker):
         Returns:
             tuple: (success, message)
         """
-        # Preconditions
-        if not self.is_configured():
-            return False, f"{self.tracker_id} tracker not configured"
-        if not os.path.exists(torrent_path):
-            return False, f"Torrent file not found: {torrent_path}"
-        
-        # Prepare cover art
-        cover_path = self._prepare_cover_image(metadata)
-        
-        # Build form data
-        data = self._build_form_data(metadata, description)
-        
-        # Build file payload
-        files = self._build_file_payload(torrent_path, cover_path)
+        return self._do_upload(torrent_path, description, metadata)
+    
+    def _build_auth(self, data: Dict[str, Any]) -> Tuple[Dict[str, str], Dict[str, str]]:
+        """
+        Build the authentication for an upload.
+        Override this if your tracker authenticates differently.
         
-        # Debug mode: just print what would happen
-        if self.debug_mode:
-            logger.info(f"=== DEBUG MODE {self.tracker_id} UPLOAD ===")
-            logger.info(f"POST URL: {self.upload_url}")
-            
-            # Log API key info
-            if self.api_key:
-                logger.info(f"API Token: {self.api_key[:4]}****")
-            
-            logger.info(f"DATA: {data}")
-            logger.info(f"FILES: {list(files.keys())}")
-            
-            # Close file handles
-            for _, f in files.items():
-                try:
-                    f[1].close()
-                except:
-                    pass
+        Args:
+            data: Form data for the upload; the 'token' auth type adds to it
             
-            return True, f"Debug mode: {self.tracker_id} upload simulation successful"
-        
-        # Prepare upload endpoint
-        upload_url = self.upload_url
-        
-        # If URL doesn't look like a full API endpoint, construct it
-        if not upload_url.startswith('http'):
-            upload_url = urljoin(self.site_url, upload_url)
-        
-        # Prepare auth params and headers based on API auth type
+        Returns:
+            tuple: (query params, request headers)
+        """
         auth_params = {}
         auth_headers = {}
         
         if self.use_api and self.api_key:
             # Choose authentication method based on config
             if self.api_auth_type == 'bearer':
-                # Use Bearer token in Authorization header
-                auth_headers = {
-                    'Authorization': f"Bearer {self.api_key}"
-                }
+                # Bearer token in the Authorization header, set on the session
                 logger.info("Using Bearer token authentication")
             elif self.api_auth_type == 'param':
                 # Use API key as URL parameter
@@ -190,114 +167,52 @@ class TemplateTracker(GenericTracker):
                 data['api_token'] = self.api_key
                 logger.info("Using form token authentication")
             else:
-                # Fallback to Bearer token
-                auth_headers = {
-                    'Authorization': f"Bearer {self.api_key}"
-                }
+                # Fallback to Bearer token, set on the session
                 logger.info("Using default Bearer token authentication")
         else:
             # For non-API uploads, might need to login first
             logger.info("Using web form upload (non-API)")
         
-        # Set content type based on API format
+        # The torrent always goes up as a file, so the body is multipart even
+        # for JSON APIs. Leave Content-Type to the encoder: a JSON header
+        # here would mislabel the multipart body.
         if self.api_format == 'json':
-            auth_headers['Content-Type'] = 'application/json'
-            # Convert data to JSON string for some APIs
-            if files:
-                logger.info("Using multipart upload with JSON data")
-            else:
-                # For JSON-only APIs with no files
-                data = json.dumps(data)
-                logger.info("Using JSON-only upload format")
+            logger.info("Using multipart upload with JSON API")
         
-        # Perform the upload
-        try:
-            logger.info(f"Uploading torrent to {self.tracker_id} at {upload_url}")
-            
-            # Execute the upload request
-            response = self.session.post(
-                url=upload_url,
-                params=auth_params,
-                headers=auth_headers,
-                data=data,
-                files=files,
-                timeout=60
-            )
-            
-            # Close file handles
-            for _, f in files.items():
-                try:
-                    f[1].close()
-                except:
-                    pass
-            
-            # Process the response
-            if not response.ok:
-                error_message = self._handle_error_response(response)
-                return False, error_message
-            
-            # Try to parse success response
-            try:
-                if 'application/json' in response.headers.get('Content-Type', ''):
-                    result = response.json()
-                    if isinstance(result, dict):
-                        if 'success' in result and result['success']:
-                            # Extract success message if available
-                            message = result.get('message', f'{self.tracker_id} upload successful')
-                            return True, message
-                        elif 'message' in result:
-                            return True, result['message']
-            except Exception as e:
-                logger.warning(f"Could not parse success response: {e}")
-            
-            # Default success
-            return True, f"{self.tracker_id} upload successful"
-            
-        except Exception as e:
-            # Close file handles on exception
-            for _, f in files.items():
-                try:
-                    f[1].close()
-                except:
-                    pass
-            
-            logger.error(f"Exception during {self.tracker_id} upload: {e}")
-            return False, f"Exception during {self.tracker_id} upload: {e}"
-            
-    def _handle_error_response(self, response) -> str:
+        return auth_params, auth_headers
+    
+    def _handle_error_response(self, response, data: Any = None) -> str:
         """
         Handle error responses from the tracker.
         Override this if your tracker has specific error formats.
         
         Args:
             response: Response object from request
+            data: Response body already decoded by the caller, if any
             
         Returns:
             str: Error message
         """
-        # Start with default error message
-        error_message = f"{response.status_code} - {response.text[:200]}"
-        
         # Try to parse JSON responses
-        if 'application/json' in response.headers.get('Content-Type', ''):
+        if data is None and 'application/json' in response.headers.get('Content-Type', ''):
             try:
-                data = response.json()
-                if isinstance(data, dict):
-                    # Different APIs use different keys for error messages
-                    for key in ['error', 'message', 'error_message', 'msg', 'errorMsg']:
-                        if key in data:
-                            return f"{data[key]}"
-                            
-                    # Check for validation errors
-                    if 'errors' in data and isinstance(data['errors'], dict):
-                        errors = []
-                        for field, msgs in data['errors'].items():
-                            if isinstance(msgs, list):
-                                errors.append(f"{field}: {', '.join(msgs)}")
-                            else:
-                                errors.append(f"{field}: {msgs}")
-                        return f"Validation errors: {'; '.join(errors)}"
+                data = parse_json(response)
             except Exception as e:
-                logger.warning(f"Could not parse JSON error response: {e}")
+                logger.warning("Could not parse JSON error response: %s", e)
         
-        return error_message
\ No newline at end of file
+        if isinstance(data, dict):
+            # Different APIs use different keys for error messages
+            key = next((key for key in _ERROR_KEYS if key in data), None)
+            if key is not None:
+                return f"{data[key]}"
+            
+            # Check for validation errors
+            errors = data.get('errors')
+            if isinstance(errors, dict):
+                return "Validation errors: " + '; '.join(
+                    f"{field}: {', '.join(msgs) if isinstance(msgs, list) else msgs}"
+                    for field, msgs in errors.items()
+                )
+        
+        # Fall back to the status and start of the body
+        return f"{response.status_code} - {response.content[:200].decode('utf-8', errors='replace')}"
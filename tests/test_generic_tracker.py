@@ -0,0 +1,133 @@
+"""
+Tests for GenericTracker's upload retry handling.
+"""
+
+import pytest
+import requests
+
+from modules.upload.trackers import generic_tracker
+from modules.upload.trackers.generic_tracker import GenericTracker
+from modules.upload.trackers.sp_tracker import SPTracker
+
+TORRENT_BYTES = b'd8:announce3:urle'
+
+
+def make_response(status: int, headers: dict = None) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status
+    response._content = b'{}'
+    response.headers['Content-Type'] = 'application/json'
+    response.headers.update(headers or {})
+    return response
+
+
+class FakePost:
+    """Stands in for _post_multipart, replaying responses in order."""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.handles = []
+        self.bodies = []
+
+    def __call__(self, url, data, files, **kwargs):
+        handle = files['torrent'][1]
+        self.handles.append(handle)
+        self.bodies.append(handle.read())
+        return self.responses.pop(0)
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    delays = []
+    monkeypatch.setattr(generic_tracker.time, 'sleep', delays.append)
+    return delays
+
+
+@pytest.fixture
+def torrent_path(tmp_path):
+    path = tmp_path / 'release.torrent'
+    path.write_bytes(TORRENT_BYTES)
+    return str(path)
+
+
+def make_tracker(tmp_path, monkeypatch, post, **tracker_config):
+    tracker = SPTracker({
+        'temp_dir': str(tmp_path / 'temp'),
+        'trackers': {
+            'SP': dict({
+                'api_key': 'key',
+                'upload_url': 'https://sp.example/api/torrents/upload'
+            }, **tracker_config)
+        }
+    })
+    monkeypatch.setattr(tracker, '_post_multipart', post)
+    return tracker
+
+
+def test_429_is_retried_with_a_fresh_payload(tmp_path, monkeypatch, sleeps, torrent_path):
+    post = FakePost(make_response(429), make_response(200))
+    tracker = make_tracker(tmp_path, monkeypatch, post)
+
+    success, _ = tracker.upload(torrent_path, 'description', {'album': 'Album'})
+
+    assert success is True
+    assert len(post.handles) == 2
+    assert post.handles[0] is not post.handles[1]
+    assert post.bodies == [TORRENT_BYTES, TORRENT_BYTES]
+    assert all(handle.closed for handle in post.handles)
+    assert len(sleeps) == 1
+
+
+def test_retry_after_is_honoured(tmp_path, monkeypatch, sleeps, torrent_path):
+    post = FakePost(make_response(503, {'Retry-After': '7'}), make_response(200))
+    tracker = make_tracker(tmp_path, monkeypatch, post)
+
+    tracker.upload(torrent_path, 'description', {'album': 'Album'})
+
+    assert sleeps == [7.0]
+
+
+@pytest.mark.parametrize('retry_after, expected', [
+    ('0', 0.0),
+    ('12', 12.0),
+    ('60', 60.0),
+    ('3600', 60.0),
+])
+def test_retry_after_seconds_are_capped(retry_after, expected):
+    response = make_response(429, {'Retry-After': retry_after})
+
+    assert GenericTracker._retry_delay(response, 0) == expected
+
+
+@pytest.mark.parametrize('headers', [{}, {'Retry-After': 'Wed, 21 Oct 2015 07:28:00 GMT'}])
+def test_backoff_without_numeric_retry_after(headers):
+    response = make_response(429, headers)
+
+    for attempt in range(10):
+        delay = GenericTracker._retry_delay(response, attempt)
+        base = min(0.5 * 2 ** attempt, 30.0)
+        assert base <= delay <= base + 0.5
+
+
+@pytest.mark.parametrize('status', [500, 502, 504, 400])
+def test_other_errors_are_not_retried(tmp_path, monkeypatch, sleeps, torrent_path, status):
+    post = FakePost(make_response(status), make_response(200))
+    tracker = make_tracker(tmp_path, monkeypatch, post)
+
+    success, _ = tracker.upload(torrent_path, 'description', {'album': 'Album'})
+
+    assert success is False
+    assert len(post.handles) == 1
+    assert sleeps == []
+
+
+@pytest.mark.parametrize('retries', [0, 1, 3])
+def test_gives_up_after_upload_retries(tmp_path, monkeypatch, sleeps, torrent_path, retries):
+    post = FakePost(*[make_response(503)] * (retries + 2))
+    tracker = make_tracker(tmp_path, monkeypatch, post, upload_retries=retries)
+
+    success, _ = tracker.upload(torrent_path, 'description', {'album': 'Album'})
+
+    assert success is False
+    assert len(post.handles) == retries + 1
+    assert len(sleeps) == retries
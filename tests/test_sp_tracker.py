@@ -0,0 +1,91 @@
+"""
+Tests for the SP tracker's form data and response handling.
+"""
+
+import copy
+import json
+
+import pytest
+import requests
+
+from modules.upload.trackers.sp_tracker import SPTracker
+
+
+def make_response(status: int, body: bytes, content_type: str = 'application/json') -> requests.Response:
+    response = requests.Response()
+    response.status_code = status
+    response._content = body
+    response.headers['Content-Type'] = content_type
+    return response
+
+
+@pytest.fixture
+def tracker(tmp_path):
+    return SPTracker({
+        'temp_dir': str(tmp_path / 'temp'),
+        'trackers': {
+            'SP': {
+                'api_key': 'key',
+                'url': 'https://sp.example',
+                'upload_url': 'https://sp.example/api/torrents/upload'
+            }
+        }
+    })
+
+
+@pytest.mark.parametrize('body', [
+    {'error': 'Invalid torrent'},
+    {'errors': {'name': ['required']}},
+    {},
+])
+def test_error_json_without_message_is_a_failure(tracker, body):
+    response = make_response(422, json.dumps(body).encode())
+
+    success, message = tracker._parse_upload_response(response)
+
+    assert success is False
+    if 'error' in body:
+        assert message == 'Invalid torrent'
+
+
+def test_error_json_without_message_fails_upload(tracker, tmp_path, monkeypatch):
+    torrent_path = tmp_path / 'release.torrent'
+    torrent_path.write_bytes(b'd8:announce3:urle')
+    response = make_response(400, b'{"error": "Duplicate"}')
+    monkeypatch.setattr(tracker, '_post_multipart', lambda *args, **kwargs: response)
+
+    assert tracker.upload(str(torrent_path), 'description', {'album': 'Album'}) == (False, 'Duplicate')
+
+
+def test_error_json_with_message_lists_field_errors(tracker):
+    body = {'message': 'Validation failed', 'errors': {'name': ['too short', 'taken'], 'type_id': 'bad'}}
+    response = make_response(422, json.dumps(body).encode())
+
+    assert tracker._parse_upload_response(response) == (
+        False, 'Validation failed\n- name: too short, taken\n- type_id: bad'
+    )
+
+
+def test_build_form_data_does_not_mutate_genres(tracker):
+    genres = ['Rock', 'Indie']
+    metadata = {'album': 'Album', 'artists': ['Artist'], 'genres': genres}
+    original = copy.deepcopy(metadata)
+
+    first = tracker._build_form_data(metadata, 'description')
+    second = tracker._build_form_data(metadata, 'description')
+
+    assert metadata == original
+    assert metadata['genres'] is genres
+    assert first['keywords'] == ['Rock', 'Indie', 'Album']
+    assert second['keywords'] == first['keywords']
+    assert first['keywords'] is not genres
+
+
+@pytest.mark.parametrize('release_name, expected', [
+    ('Artist - Album (2020) MP3', 'Artist - Album (2020) FLAC'),
+    ('Artist - MP320 Sessions FLAC', 'Artist - MP320 Sessions FLAC'),
+])
+def test_build_form_data_fixes_mp3_token_only(tracker, release_name, expected):
+    data = tracker._build_form_data({'release_name': release_name, 'format': 'FLAC'}, 'description')
+
+    assert data['name'] == expected
@@ -0,0 +1,158 @@
+"""
+Tests for bencoding and piece hashing in modules.upload.torrent.
+"""
+
+import hashlib
+import pathlib
+import random
+
+import pytest
+
+from modules.upload import torrent
+from modules.upload.torrent import TorrentCreator, _bencode_to
+
+PIECE_SIZES = [16 * 1024, 32 * 1024, 64 * 1024]
+WORKERS = range(1, 9)
+
+
+def reference_pieces(data: bytes, piece_size: int) -> bytes:
+    """SHA-1 of each piece_size slice of data, concatenated."""
+    return b''.join(
+        hashlib.sha1(data[i:i + piece_size]).digest()
+        for i in range(0, len(data), piece_size)
+    )
+
+
+def make_creator(workers: int) -> TorrentCreator:
+    return TorrentCreator({'torrent': {'hash_workers': workers}})
+
+
+@pytest.fixture(scope='module')
+def tiny_files_dir(tmp_path_factory):
+    """1,500 small files, so most pieces span many file boundaries."""
+    rng = random.Random(1500)
+    root = tmp_path_factory.mktemp('tiny')
+    for i in range(1500):
+        subdir = root / f"disc{i // 500}"
+        subdir.mkdir(exist_ok=True)
+        (subdir / f"{i:04d}.flac").write_bytes(rng.randbytes(rng.randint(0, 300)))
+    return str(root)
+
+
+@pytest.fixture(scope='module')
+def mixed_files_dir(tmp_path_factory):
+    """A few files larger than a piece between empty and tiny ones."""
+    rng = random.Random(64)
+    root = tmp_path_factory.mktemp('mixed')
+    sizes = [0, 1, 200 * 1024 + 7, 3, 65536, 0, 100 * 1024 + 1, 16383]
+    for i, size in enumerate(sizes):
+        (root / f"{i:02d}.flac").write_bytes(rng.randbytes(size))
+    return str(root)
+
+
+def concatenated(creator: TorrentCreator, dir_path: str):
+    files = creator._scan_tree(dir_path)
+    data = b''.join(
+        pathlib.Path(dir_path, *f['path']).read_bytes() for f in files
+    )
+    return files, data
+
+
+@pytest.mark.parametrize('workers', WORKERS)
+@pytest.mark.parametrize('piece_size', PIECE_SIZES)
+def test_tiny_files_match_reference(tiny_files_dir, piece_size, workers):
+    creator = make_creator(workers)
+    files, data = concatenated(creator, tiny_files_dir)
+    assert len(files) == 1500
+
+    pieces = creator._calculate_pieces_for_files(tiny_files_dir, files, piece_size)
+
+    assert bytes(pieces) == reference_pieces(data, piece_size)
+
+
+@pytest.mark.parametrize('workers', WORKERS)
+@pytest.mark.parametrize('piece_size', PIECE_SIZES)
+def test_mixed_files_match_reference(mixed_files_dir, piece_size, workers):
+    creator = make_creator(workers)
+    files, data = concatenated(creator, mixed_files_dir)
+
+    pieces = creator._calculate_pieces_for_files(mixed_files_dir, files, piece_size)
+
+    assert bytes(pieces) == reference_pieces(data, piece_size)
+
+
+@pytest.mark.parametrize('workers', WORKERS)
+@pytest.mark.parametrize('piece_size', PIECE_SIZES)
+def test_single_file_matches_reference(tmp_path, piece_size, workers):
+    data = random.Random(piece_size + workers).randbytes(5 * piece_size + 123)
+    path = tmp_path / 'track.flac'
+    path.write_bytes(data)
+
+    pieces = make_creator(workers)._calculate_pieces(str(path), piece_size, len(data))
+
+    assert bytes(pieces) == reference_pieces(data, piece_size)
+
+
+def bencode(obj) -> bytes:
+    chunks = []
+    _bencode_to(chunks.append, obj)
+    return b''.join(chunks)
+
+
+@pytest.mark.parametrize('obj, expected', [
+    (0, b'i0e'),
+    (42, b'i42e'),
+    (-7, b'i-7e'),
+    ('', b'0:'),
+    ('spam', b'4:spam'),
+    ('\u00e9', b'2:\xc3\xa9'),
+    (b'\x00\xff', b'2:\x00\xff'),
+    (bytearray(b'eggs'), b'4:eggs'),
+    ([], b'le'),
+    ((), b'le'),
+    ({}, b'de'),
+    ([1, 'a', b'b', [-1]], b'li1e1:a1:bli-1eee'),
+    (
+        {'zeta': {'b': [], 'a': {}}, 'alpha': -12, 'mid': bytearray(b'xy'), 'beta': ['s', b'b']},
+        b'd5:alphai-12e4:betal1:s1:be3:mid2:xy4:zetad1:ade1:bleee'
+    ),
+])
+def test_bencode_golden_bytes(obj, expected):
+    assert bencode(obj) == expected
+
+
+@pytest.mark.parametrize('obj', [1.5, None, [None], {'key': 0.0}])
+def test_bencode_rejects_unsupported_types(obj):
+    with pytest.raises(TypeError):
+        bencode(obj)
+
+
+def test_create_torrent_golden_bytes(tmp_path, monkeypatch):
+    album = tmp_path / 'Album'
+    (album / 'CD2').mkdir(parents=True)
+    (album / '01.flac').write_bytes(b'abc')
+    (album / 'CD2' / '02.flac').write_bytes(b'de')
+    (album / '.hidden').write_bytes(b'skipped')
+    monkeypatch.setattr(torrent.time, 'time', lambda: 1700000000)
+
+    creator = TorrentCreator({'output_dir': str(tmp_path / 'out'), 'torrent': {'hash_workers': 2}})
+    output_path = creator.create_torrent(str(album), announce_url='https://t.example/announce', piece_size=16)
+
+    assert output_path == str(tmp_path / 'out' / 'Album.torrent')
+    assert pathlib.Path(output_path).read_bytes() == (
+        b'd'
+        b'8:announce26:https://t.example/announce'
+        b'7:comment35:Created with Music-Upload-Assistant'
+        b'10:created by22:Music-Upload-Assistant'
+        b'13:creation datei1700000000e'
+        b'4:infod'
+        b'5:filesl'
+        b'd6:lengthi3e4:pathl7:01.flaceed6:lengthi2e4:pathl3:CD27:02.flaceee'
+        b'4:name5:Album'
+        b'12:piece lengthi16384e'
+        b'6:pieces20:' + hashlib.sha1(b'abcde').digest() +
+        b'7:privatei1e'
+        b'6:source3:MUA'
+        b'e'
+        b'e'
+    )
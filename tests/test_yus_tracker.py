@@ -0,0 +1,23 @@
+"""
+Tests for the YUS tracker's form data.
+"""
+
+import pytest
+
+from modules.upload.trackers.yus_tracker import YUSTracker
+
+
+@pytest.fixture
+def tracker():
+    return YUSTracker({'trackers': {'YUS': {'api_key': 'key'}}})
+
+
+@pytest.mark.parametrize('release_name, expected', [
+    ('Artist - Album (2020) MP3', 'Artist - Album (2020) FLAC'),
+    ('Artist - MP320 Sessions FLAC', 'Artist - MP320 Sessions FLAC'),
+])
+def test_build_form_data_fixes_mp3_token_only(tracker, release_name, expected):
+    data = tracker._build_form_data({'release_name': release_name, 'format': 'FLAC'}, 'description')
+
+    assert data['name'] == expected
+    assert data['type_id'] == '16'